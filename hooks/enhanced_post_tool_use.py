@@ -3,6 +3,7 @@
 # requires-python = ">=3.8"
 # dependencies = [
 #     "psutil>=5.9.0",
+#     "orjson>=3.9",
 # ]
 # ///
 
@@ -11,13 +12,16 @@ ABOUTME: Enhanced post-tool-use hook with performance metrics and analysis integ
 ABOUTME: Collects detailed metrics and triggers real-time analysis for optimization insights.
 """
 
+import fcntl
 import json
 import os
+import re
 import sys
+import tempfile
 import time
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 import resource
 
 try:
@@ -26,6 +30,55 @@ try:
 except ImportError:
     PSUTIL_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Log locations, resolved once per hook process
+LOG_DIR = Path.cwd() / 'logs'
+ORIGINAL_LOG_PATH = LOG_DIR / 'post_tool_use.ndjson'
+ENHANCED_LOG_PATH = LOG_DIR / 'enhanced_tool_use.ndjson'
+ERROR_LOG_PATH = LOG_DIR / 'hook_errors.ndjson'
+# Pre-NDJSON log files, migrated on first write
+LEGACY_ORIGINAL_LOG_PATH = LOG_DIR / 'post_tool_use.json'
+LEGACY_ENHANCED_LOG_PATH = LOG_DIR / 'enhanced_tool_use.json'
+LEGACY_ERROR_LOG_PATH = LOG_DIR / 'hook_errors.json'
+
+ANALYSIS_SCRIPT = Path(__file__).parent.parent / 'analysis' / 'real_time_monitor.py'
+ANALYSIS_SCRIPT_EXISTS = ANALYSIS_SCRIPT.exists()
+# Held by the running monitor for its whole lifetime (single-instance guard)
+ANALYSIS_LOCK_PATH = LOG_DIR / 'real_time_monitor.lock'
+
+_process = None
+if PSUTIL_AVAILABLE:
+    try:
+        _process = psutil.Process()
+    except Exception:
+        PSUTIL_AVAILABLE = False
+
+
+def quantize_seconds(value: float) -> float:
+    """Round a duration in seconds to microsecond precision.
+    
+    Hook-side durations are typically well under a millisecond, so coarser
+    rounding would flatten them to 0.0.
+    """
+    return round(value, 6)
+
+
+def quantize_percent(value: float, digits: int = 0) -> Union[int, float]:
+    """Round a percentage to the given number of decimal places."""
+    if digits == 0:
+        return int(round(value))
+    return round(value, digits)
+
+
+def quantize_megabytes(num_bytes: int) -> float:
+    """Convert a byte count to megabytes at 0.1 MB precision."""
+    return round(num_bytes / 1024 / 1024, 1)
+
 
 def collect_performance_metrics(start_time: float) -> Dict[str, Any]:
     """Collect performance metrics for the tool execution."""
@@ -33,29 +86,36 @@ def collect_performance_metrics(start_time: float) -> Dict[str, Any]:
     execution_time = end_time - start_time
     
     metrics = {
-        'execution_time': execution_time,
+        'execution_time': quantize_seconds(execution_time),
         'timestamp': datetime.now().isoformat(),
     }
     
     # Add system resource metrics if available
     if PSUTIL_AVAILABLE:
         try:
-            process = psutil.Process()
-            metrics.update({
-                'cpu_percent': process.cpu_percent(),
-                'memory_mb': process.memory_info().rss / 1024 / 1024,
-                'memory_percent': process.memory_percent(),
-            })
+            # oneshot() reads each /proc file once for all process queries
+            with _process.oneshot():
+                metrics.update({
+                    'memory_mb': quantize_megabytes(_process.memory_info().rss),
+                    'memory_percent': quantize_percent(_process.memory_percent(), 2),
+                })
             
             # System-wide metrics
+            disk_io = psutil.disk_io_counters()
             metrics.update({
-                'system_cpu_percent': psutil.cpu_percent(interval=0.1),
-                'system_memory_percent': psutil.virtual_memory().percent,
-                'system_disk_io': dict(psutil.disk_io_counters()._asdict()) if psutil.disk_io_counters() else {},
+                'system_memory_percent': quantize_percent(psutil.virtual_memory().percent),
+                'system_disk_io': dict(disk_io._asdict()) if disk_io else {},
             })
         except:
             pass  # Ignore errors in metric collection
     
+    # System load needs no sampling window, unlike cpu_percent, which would
+    # only measure the few milliseconds this hook has been alive
+    try:
+        metrics['system_load_avg'] = [round(load, 2) for load in os.getloadavg()]
+    except (AttributeError, OSError):
+        pass  # Not available on this platform
+    
     # Add resource usage metrics
     try:
         usage = resource.getrusage(resource.RUSAGE_SELF)
@@ -71,8 +131,12 @@ def collect_performance_metrics(start_time: float) -> Dict[str, Any]:
 
 
 def enhance_log_data(input_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Enhance log data with additional context and analysis triggers."""
-    enhanced_data = input_data.copy()
+    """Enhance log data with additional context and analysis triggers.
+    
+    Mutates and returns input_data rather than copying it, so callers that
+    still need the raw payload must serialize it first.
+    """
+    enhanced_data = input_data
     
     # Add event type for analysis
     enhanced_data['event_type'] = 'tool_use'
@@ -103,68 +167,240 @@ def enhance_log_data(input_data: Dict[str, Any]) -> Dict[str, Any]:
     return enhanced_data
 
 
+# Error categories in priority order: the first category with a matching
+# keyword wins, regardless of where in the message the keyword appears.
+_ERROR_CATEGORIES = [
+    (('timeout', 'timed out'),
+     {'error_type': 'timeout', 'is_retryable': True, 'severity': 'medium'}),
+    (('permission', 'unauthorized', 'access denied'),
+     {'error_type': 'permission', 'is_retryable': False, 'severity': 'high'}),
+    (('not found', '404', 'missing'),
+     {'error_type': 'not_found', 'is_retryable': False, 'severity': 'medium'}),
+    (('network', 'connection', 'dns'),
+     {'error_type': 'network', 'is_retryable': True, 'severity': 'medium'}),
+    (('memory', 'out of memory', 'oom'),
+     {'error_type': 'resource', 'is_retryable': True, 'severity': 'high'}),
+    (('syntax', 'invalid', 'malformed'),
+     {'error_type': 'validation', 'is_retryable': False, 'severity': 'medium'}),
+]
+
+_UNKNOWN_ERROR = {'error_type': 'unknown', 'is_retryable': False, 'severity': 'medium'}
+
+# Keyword -> index into _ERROR_CATEGORIES
+_ERROR_KEYWORD_PRIORITY = {
+    keyword: priority
+    for priority, (keywords, _) in enumerate(_ERROR_CATEGORIES)
+    for keyword in keywords
+}
+
+# Single alternation over every keyword, letting classify_error scan the
+# message once. The zero-width lookahead reports a match at every start
+# position, so overlapping keywords can't hide each other (in "oomissing",
+# "missing" still counts even though "oom" starts earlier), and ordering the
+# alternatives by priority makes each position report its best keyword.
+_ERROR_KEYWORD_PATTERN = re.compile('(?=(' + '|'.join(
+    re.escape(keyword)
+    for keyword in sorted(_ERROR_KEYWORD_PRIORITY, key=_ERROR_KEYWORD_PRIORITY.get)
+) + '))')
+
+
 def classify_error(error_message: str) -> Dict[str, Any]:
     """Classify error types for better pattern detection."""
-    error_lower = error_message.lower()
-    
-    classification = {
-        'error_type': 'unknown',
-        'is_retryable': False,
-        'severity': 'medium'
-    }
-    
-    # Classify error types
-    if any(word in error_lower for word in ['timeout', 'timed out']):
-        classification['error_type'] = 'timeout'
-        classification['is_retryable'] = True
-        classification['severity'] = 'medium'
-    elif any(word in error_lower for word in ['permission', 'unauthorized', 'access denied']):
-        classification['error_type'] = 'permission'
-        classification['is_retryable'] = False
-        classification['severity'] = 'high'
-    elif any(word in error_lower for word in ['not found', '404', 'missing']):
-        classification['error_type'] = 'not_found'
-        classification['is_retryable'] = False
-        classification['severity'] = 'medium'
-    elif any(word in error_lower for word in ['network', 'connection', 'dns']):
-        classification['error_type'] = 'network'
-        classification['is_retryable'] = True
-        classification['severity'] = 'medium'
-    elif any(word in error_lower for word in ['memory', 'out of memory', 'oom']):
-        classification['error_type'] = 'resource'
-        classification['is_retryable'] = True
-        classification['severity'] = 'high'
-    elif any(word in error_lower for word in ['syntax', 'invalid', 'malformed']):
-        classification['error_type'] = 'validation'
-        classification['is_retryable'] = False
-        classification['severity'] = 'medium'
+    best_priority = None
+    for match in _ERROR_KEYWORD_PATTERN.finditer(error_message.lower()):
+        priority = _ERROR_KEYWORD_PRIORITY[match.group(1)]
+        if best_priority is None or priority < best_priority:
+            best_priority = priority
+            if priority == 0:
+                break  # Nothing outranks the first category
     
-    return classification
+    if best_priority is None:
+        return dict(_UNKNOWN_ERROR)
+    return dict(_ERROR_CATEGORIES[best_priority][1])
 
 
-def trigger_analysis(log_data: Dict[str, Any]) -> None:
-    """Trigger real-time analysis if conditions are met."""
+# Tools whose every use is worth handing to the analyzer
+IMPORTANT_TOOLS = frozenset({'environment_run_cmd', 'Write', 'Edit'})
+
+
+def trigger_analysis(log_data: Dict[str, Any]) -> bool:
+    """Trigger real-time analysis if conditions are met.
+    
+    Returns True when the monitor should be launched for this event.
+    """
     # Only trigger analysis for significant events
     should_analyze = (
         log_data.get('error') or  # Any error
         (log_data.get('metrics', {}).get('execution_time', 0) > 30) or  # Long execution
-        (log_data.get('tool_name', '') in ['environment_run_cmd', 'Write', 'Edit'])  # Important tools
+        (log_data.get('tool_name', '') in IMPORTANT_TOOLS)  # Important tools
     )
     
     if should_analyze:
         try:
-            # Try to trigger real-time analysis (fire-and-forget)
-            analysis_script = Path(__file__).parent.parent / 'analysis' / 'real_time_monitor.py'
-            if analysis_script.exists():
-                # This would ideally be done via a message queue or async process
-                # For now, just log that analysis should be triggered
+            # Record the trigger; launch_analysis starts the monitor once
+            # the event has been written
+            if ANALYSIS_SCRIPT_EXISTS:
                 log_data['analysis_trigger'] = {
                     'should_analyze': True,
                     'trigger_reason': 'significant_event',
-                    'analysis_script': str(analysis_script)
+                    'analysis_script': str(ANALYSIS_SCRIPT)
                 }
+                return True
         except Exception:
             pass  # Don't let analysis triggering break the main hook
+    return False
+
+
+def launch_analysis() -> None:
+    """Start the real-time monitor detached from the hook (fire-and-forget).
+    
+    posix_spawn avoids duplicating this process the way fork-based Popen
+    does, and the child gets its own session with stdio on /dev/null so
+    the hook can exit immediately without waiting on it.
+    
+    Only one monitor runs at a time: the hook takes a non-blocking flock on
+    ANALYSIS_LOCK_PATH and hands the locked descriptor to the child, so the
+    lock is held until the monitor exits. While it is held, later triggers
+    skip the launch; the running monitor picks their events up from the
+    enhanced log, which they have already been appended to.
+    """
+    if not ANALYSIS_SCRIPT_EXISTS:
+        return
+    
+    # Always the bundled monitor; never a path taken from the event payload
+    argv = ['uv', 'run', str(ANALYSIS_SCRIPT)]
+    try:
+        lock_fd = os.open(ANALYSIS_LOCK_PATH, os.O_WRONLY | os.O_CREAT, 0o644)
+    except OSError:
+        return
+    try:
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return  # A monitor is already running
+        os.set_inheritable(lock_fd, True)
+        try:
+            os.posix_spawnp(
+                argv[0], argv, os.environ,
+                file_actions=[
+                    (os.POSIX_SPAWN_OPEN, fd, os.devnull, os.O_RDWR, 0)
+                    for fd in (0, 1, 2)
+                ],
+                setsid=True,
+            )
+        except (AttributeError, NotImplementedError):
+            # posix_spawn (or its setsid flag) is unavailable on this platform
+            import subprocess
+            subprocess.Popen(
+                argv,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+                pass_fds=(lock_fd,),
+            )
+    except Exception:
+        pass  # Don't let analysis launching break the main hook
+    finally:
+        os.close(lock_fd)  # The child's inherited copy keeps the lock
+
+
+def dumps_line(record: Dict[str, Any]) -> bytes:
+    """Serialize a record to a UTF-8 JSON line, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record) + '\n').encode('utf-8')
+
+
+def loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def append_ndjson(log_path: Path, record: Dict[str, Any],
+                  legacy_path: Optional[Path] = None) -> None:
+    """Append a single record as one line of newline-delimited JSON.
+    
+    The line is written with one os.write on an O_APPEND descriptor, so
+    concurrent hook invocations never interleave partial records and the
+    cost per event stays constant regardless of how long the log grows.
+    The log directory and legacy migration are only touched when the log
+    doesn't exist yet, keeping the common path to a single open.
+    """
+    line = dumps_line(record)
+    try:
+        fd = os.open(log_path, os.O_WRONLY | os.O_APPEND)
+    except FileNotFoundError:
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = create_ndjson_log(log_path, legacy_path)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def create_ndjson_log(log_path: Path, legacy_path: Optional[Path] = None) -> int:
+    """Create (or open) an NDJSON log for appending, migrating the legacy log first.
+    
+    Parallel tool calls run hooks concurrently, so creation is serialized on
+    an flock of a sibling lock file: the first holder migrates, and everyone
+    after it finds the log already in place. No process can create an empty
+    log (and so skip the migration) while another is still migrating.
+    """
+    lock_path = log_path.with_name(log_path.name + '.lock')
+    lock_fd = os.open(lock_path, os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX)
+        if legacy_path is not None:
+            migrate_json_log(legacy_path, log_path)
+        return os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    finally:
+        os.close(lock_fd)  # Releases the flock
+
+
+def migrate_json_log(legacy_path: Path, ndjson_path: Path) -> None:
+    """One-time conversion of a legacy JSON-array log to NDJSON.
+    
+    Must be called with the log's creation lock held (see create_ndjson_log).
+    """
+    if ndjson_path.exists() or not legacy_path.exists():
+        return
+    
+    with open(legacy_path, 'rb') as f:
+        data = f.read()
+    try:
+        records = loads(data)
+    except (json.JSONDecodeError, ValueError):
+        records = None
+    if records is None and ORJSON_AVAILABLE:
+        # The legacy logs were written by stdlib json, which also emits the
+        # NaN/Infinity literals orjson rejects
+        try:
+            records = json.loads(data)
+        except (json.JSONDecodeError, ValueError):
+            records = None
+    if not isinstance(records, list):
+        # Unreadable: set it aside for inspection rather than deleting it
+        os.replace(legacy_path, legacy_path.with_name(legacy_path.name + '.corrupt'))
+        return
+    
+    # Write to a uniquely named temporary file first so a crash never leaves
+    # a half-migrated log (or a stale .tmp that collides with the next run)
+    tmp_fd, tmp_name = tempfile.mkstemp(
+        dir=ndjson_path.parent, prefix=ndjson_path.name + '.', suffix='.tmp'
+    )
+    try:
+        os.fchmod(tmp_fd, 0o644)
+        with os.fdopen(tmp_fd, 'wb') as f:
+            for record in records:
+                f.write(dumps_line(record))
+        os.replace(tmp_name, ndjson_path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    legacy_path.unlink(missing_ok=True)
 
 
 def main():
@@ -173,53 +409,31 @@ def main():
     
     try:
         # Read JSON input from stdin
-        input_data = json.load(sys.stdin)
+        input_data = loads(sys.stdin.buffer.read())
         
         # Collect performance metrics
         metrics = collect_performance_metrics(start_time)
         
+        # Write to original log file (for compatibility) before enhancement
+        # mutates the payload in place
+        append_ndjson(ORIGINAL_LOG_PATH, input_data, LEGACY_ORIGINAL_LOG_PATH)
+        
+        # Only trigger_analysis may set analysis_trigger, not the caller
+        input_data.pop('analysis_trigger', None)
+        
         # Enhance log data
         enhanced_data = enhance_log_data(input_data)
         enhanced_data['metrics'] = metrics
         
         # Trigger analysis if needed
-        trigger_analysis(enhanced_data)
-        
-        # Ensure log directory exists
-        log_dir = Path.cwd() / 'logs'
-        log_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Write to original log file (for compatibility)
-        original_log_path = log_dir / 'post_tool_use.json'
-        if original_log_path.exists():
-            with open(original_log_path, 'r') as f:
-                try:
-                    log_data = json.load(f)
-                except (json.JSONDecodeError, ValueError):
-                    log_data = []
-        else:
-            log_data = []
-        
-        log_data.append(input_data)  # Original data for compatibility
-        
-        with open(original_log_path, 'w') as f:
-            json.dump(log_data, f, indent=2)
+        should_launch = trigger_analysis(enhanced_data)
         
         # Write to enhanced log file (for analysis)
-        enhanced_log_path = log_dir / 'enhanced_tool_use.json'
-        if enhanced_log_path.exists():
-            with open(enhanced_log_path, 'r') as f:
-                try:
-                    enhanced_log_data = json.load(f)
-                except (json.JSONDecodeError, ValueError):
-                    enhanced_log_data = []
-        else:
-            enhanced_log_data = []
-        
-        enhanced_log_data.append(enhanced_data)
+        append_ndjson(ENHANCED_LOG_PATH, enhanced_data, LEGACY_ENHANCED_LOG_PATH)
         
-        with open(enhanced_log_path, 'w') as f:
-            json.dump(enhanced_log_data, f, indent=2)
+        # Hand significant events to the analyzer without waiting on it
+        if should_launch:
+            launch_analysis()
         
         sys.exit(0)
         
@@ -235,20 +449,7 @@ def main():
                 'hook_name': 'enhanced_post_tool_use'
             }
             
-            error_log_path = Path.cwd() / 'logs' / 'hook_errors.json'
-            if error_log_path.exists():
-                with open(error_log_path, 'r') as f:
-                    try:
-                        errors = json.load(f)
-                    except:
-                        errors = []
-            else:
-                errors = []
-            
-            errors.append(error_log)
-            
-            with open(error_log_path, 'w') as f:
-                json.dump(errors, f, indent=2)
+            append_ndjson(ERROR_LOG_PATH, error_log, LEGACY_ERROR_LOG_PATH)
         except:
             pass  # If we can't log the error, just continue
         
@@ -84,7 +84,7 @@ def is_env_file_access(tool_name, tool_input):
 def main():
     try:
         # Read JSON input from stdin
-        input_data = json.load(sys.stdin)
+        input_data = json.loads(sys.stdin.buffer.read())
         
         tool_name = input_data.get('tool_name', '')
         tool_input = input_data.get('tool_input', {})
@@ -9,6 +9,7 @@
 import argparse
 import json
 import os
+import shutil
 import sys
 import subprocess
 from pathlib import Path
@@ -31,6 +32,10 @@ try:
 except ImportError:
     pass  # dotenv is optional
 
+# Resolve external CLIs once via PATH lookup instead of forking `which`
+GIT_PATH = shutil.which('git')
+GH_PATH = shutil.which('gh')
+
 
 def log_session_start(input_data):
     """Log session start event to logs directory."""
@@ -57,30 +62,61 @@ def log_session_start(input_data):
         json.dump(log_data, f, indent=2)
 
 
+def is_inside_git_repo(start_dir):
+    """Check for a .git entry in start_dir or any parent without running git."""
+    if os.getenv('GIT_DIR'):
+        return True  # Explicit repository location; let git resolve it
+    current = os.path.abspath(start_dir)
+    while True:
+        if os.path.exists(os.path.join(current, '.git')):
+            return True
+        parent = os.path.dirname(current)
+        if parent == current:
+            return False
+        current = parent
+
+
+def parse_branch_header(header):
+    """Extract the branch name from a `git status --branch` header line."""
+    header = header[3:]  # Drop the leading "## "
+    for prefix in ("No commits yet on ", "Initial commit on "):
+        if header.startswith(prefix):
+            return header[len(prefix):]
+    if header.startswith("HEAD (no branch)"):
+        return "HEAD"  # Detached, matching `git rev-parse --abbrev-ref HEAD`
+    # "main...origin/main [ahead 1]" -> "main"
+    return header.split("...", 1)[0].split(" ", 1)[0]
+
+
 def get_git_status():
     """Get current git status information."""
     try:
-        # Get current branch
-        branch_result = subprocess.run(
-            ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        current_branch = branch_result.stdout.strip() if branch_result.returncode == 0 else "unknown"
+        # Outside a repository there is nothing to report; skip forking git
+        if not is_inside_git_repo(os.getcwd()):
+            return "unknown", 0
+        if GIT_PATH is None:
+            return None, None
         
-        # Get uncommitted changes count
+        # Branch and uncommitted changes from a single git invocation;
+        # optional locks off so we never contend for the index lock
         status_result = subprocess.run(
-            ['git', 'status', '--porcelain'],
+            [GIT_PATH, 'status', '--porcelain', '--branch'],
             capture_output=True,
             text=True,
-            timeout=5
+            timeout=5,
+            env={**os.environ, 'GIT_OPTIONAL_LOCKS': '0'}
         )
-        if status_result.returncode == 0:
-            changes = status_result.stdout.strip().split('\n') if status_result.stdout.strip() else []
-            uncommitted_count = len(changes)
+        if status_result.returncode != 0:
+            return "unknown", 0
+        
+        lines = status_result.stdout.splitlines()
+        if lines and lines[0].startswith('## '):
+            current_branch = parse_branch_header(lines[0])
+            changes = lines[1:]
         else:
-            uncommitted_count = 0
+            current_branch = "unknown"
+            changes = lines
+        uncommitted_count = len([line for line in changes if line.strip()])
         
         return current_branch, uncommitted_count
     except Exception:
@@ -91,13 +127,12 @@ def get_recent_issues():
     """Get recent GitHub issues if gh CLI is available."""
     try:
         # Check if gh is available
-        gh_check = subprocess.run(['which', 'gh'], capture_output=True)
-        if gh_check.returncode != 0:
+        if GH_PATH is None:
             return None
         
         # Get recent open issues
         result = subprocess.run(
-            ['gh', 'issue', 'list', '--limit', '5', '--state', 'open'],
+            [GH_PATH, 'issue', 'list', '--limit', '5', '--state', 'open'],
             capture_output=True,
             text=True,
             timeout=10
@@ -109,6 +144,25 @@ def get_recent_issues():
     return None
 
 
+def get_latest_session(active_sessions):
+    """Return the most recently modified session_*.md in a directory, or None."""
+    latest_session = None
+    latest_mtime = -1.0
+    try:
+        # One directory scan; DirEntry.stat() is the only stat per file
+        with os.scandir(active_sessions) as entries:
+            for entry in entries:
+                if not (entry.name.startswith("session_") and entry.name.endswith(".md")):
+                    continue
+                mtime = entry.stat().st_mtime
+                if mtime > latest_mtime:
+                    latest_mtime = mtime
+                    latest_session = Path(entry.path)
+    except OSError:
+        return None
+    return latest_session
+
+
 def load_development_context(source):
     """Load relevant development context based on session source."""
     context_parts = []
@@ -160,21 +214,19 @@ def load_development_context(source):
         else:
             # Load latest active session if initialized
             active_sessions = Path(project_root) / ".claude" / "sessions" / "active"
-            if active_sessions.exists():
-                sessions = list(active_sessions.glob("session_*.md"))
-                if sessions:
-                    latest_session = max(sessions, key=lambda p: p.stat().st_mtime)
-                    context_parts.append(f"\n📂 Active session: {latest_session.name}")
-                    
-                    # Load session content summary (first 500 chars)
-                    try:
-                        with open(latest_session, 'r') as f:
-                            session_content = f.read(500).strip()
-                            if session_content:
-                                context_parts.append("--- Session Context Preview ---")
-                                context_parts.append(session_content)
-                    except Exception:
-                        pass
+            latest_session = get_latest_session(active_sessions)
+            if latest_session:
+                context_parts.append(f"\n📂 Active session: {latest_session.name}")
+                
+                # Load session content summary (first 500 chars)
+                try:
+                    with open(latest_session, 'r') as f:
+                        session_content = f.read(500).strip()
+                        if session_content:
+                            context_parts.append("--- Session Context Preview ---")
+                            context_parts.append(session_content)
+                except Exception:
+                    pass
     
     # Load project-specific context files if they exist
     context_files = [
@@ -216,7 +268,7 @@ def main():
         args = parser.parse_args()
         
         # Read JSON input from stdin
-        input_data = json.loads(sys.stdin.read())
+        input_data = json.loads(sys.stdin.buffer.read())
         
         # Extract fields
         session_id = input_data.get('session_id', 'unknown')
@@ -128,7 +128,7 @@ def main():
         args = parser.parse_args()
         
         # Read JSON input from stdin
-        input_data = json.load(sys.stdin)
+        input_data = json.loads(sys.stdin.buffer.read())
 
         # Extract required fields
         session_id = input_data.get("session_id", "")
@@ -163,7 +163,7 @@ def main():
                 # Read .jsonl file and convert to JSON array
                 chat_data = []
                 try:
-                    with open(transcript_path, 'r') as f:
+                    with open(transcript_path, 'r', buffering=1 << 16) as f:  # 64KB reads for large transcripts
                         for line in f:
                             line = line.strip()
                             if line:
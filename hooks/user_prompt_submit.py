@@ -74,7 +74,7 @@ def main():
         args = parser.parse_args()
         
         # Read JSON input from stdin
-        input_data = json.loads(sys.stdin.read())
+        input_data = json.loads(sys.stdin.buffer.read())
         
         # Extract session_id and prompt
         session_id = input_data.get('session_id', 'unknown')
@@ -41,25 +41,23 @@ def prompt_llm(prompt_text):
         else:
             client = OpenAI(api_key=api_key)
         
-        # Set temperature based on model
-        temperature = 1.0 if "gpt-5" in model else 0.7
+        is_gpt5 = "gpt-5" in model
+        
+        request = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt_text}],
+            # Set temperature based on model
+            "temperature": 1.0 if is_gpt5 else 0.7,
+        }
         
         # Use different parameter name for GPT-5 models
-        if "gpt-5" in model:
+        if is_gpt5:
             # GPT-5-nano requires at least 1000 max_completion_tokens
-            response = client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt_text}],
-                max_completion_tokens=1000,
-                temperature=temperature,
-            )
+            request["max_completion_tokens"] = 1000
         else:
-            response = client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt_text}],
-                max_tokens=100,
-                temperature=temperature,
-            )
+            request["max_tokens"] = 100
+        
+        response = client.chat.completions.create(**request)
 
         return response.choices[0].message.content.strip()
 
@@ -8,10 +8,67 @@
 # ]
 # ///
 
+import json
 import os
+import queue
+import random
 import sys
+import tempfile
+import threading
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
 from dotenv import load_dotenv
 
+_env_loaded = False
+
+
+def _ensure_env():
+    """Load .env once per process instead of re-reading it on every call."""
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv()
+        _env_loaded = True
+
+
+# Provider SDKs are imported on first use and kept for later calls
+_openai_cls = None
+_anthropic_module = None
+
+
+def _get_openai():
+    """Return the OpenAI client class, importing the SDK on first use."""
+    global _openai_cls
+    if _openai_cls is None:
+        from openai import OpenAI
+        _openai_cls = OpenAI
+    return _openai_cls
+
+
+def _get_anthropic():
+    """Return the anthropic module, importing the SDK on first use."""
+    global _anthropic_module
+    if _anthropic_module is None:
+        import anthropic
+        _anthropic_module = anthropic
+    return _anthropic_module
+
+
+@lru_cache(maxsize=4)
+def _openai_client(api_key, api_base=None):
+    """Return a shared OpenAI client so its connection pool is reused."""
+    OpenAI = _get_openai()
+    # Support custom API base for OpenAI-compatible services
+    if api_base:
+        return OpenAI(api_key=api_key, base_url=api_base)
+    return OpenAI(api_key=api_key)
+
+
+@lru_cache(maxsize=4)
+def _anthropic_client(api_key):
+    """Return a shared Anthropic client so its connection pool is reused."""
+    return _get_anthropic().Anthropic(api_key=api_key)
+
 
 def prompt_llm_openai(prompt_text, model=None, max_tokens=1000, temperature=None):
     """
@@ -26,6 +83,8 @@ def prompt_llm_openai(prompt_text, model=None, max_tokens=1000, temperature=None
     Returns:
         str: The model's response text, or None if error
     """
+    _ensure_env()
+    
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         return None
@@ -35,36 +94,28 @@ def prompt_llm_openai(prompt_text, model=None, max_tokens=1000, temperature=None
         model = os.getenv("OPENAI_MODEL_NAME", "gpt-4o")
     
     try:
-        from openai import OpenAI
+        client = _openai_client(api_key, os.getenv("OPENAI_API_BASE"))
         
-        # Support custom API base for OpenAI-compatible services
-        api_base = os.getenv("OPENAI_API_BASE")
-        if api_base:
-            client = OpenAI(api_key=api_key, base_url=api_base)
-        else:
-            client = OpenAI(api_key=api_key)
+        is_gpt5 = "gpt-5" in model
         
         # Set temperature based on model
         if temperature is None:
-            temperature = 1.0 if "gpt-5" in model else 0.7
+            temperature = 1.0 if is_gpt5 else 0.7
+        
+        request = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt_text}],
+            "temperature": temperature,
+        }
         
         # Use different parameter name for GPT-5 models
-        if "gpt-5" in model:
+        if is_gpt5:
             # GPT-5-nano requires at least 1000 max_completion_tokens
-            gpt5_max_tokens = max(max_tokens, 1000)
-            response = client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt_text}],
-                max_completion_tokens=gpt5_max_tokens,
-                temperature=temperature,
-            )
+            request["max_completion_tokens"] = max(max_tokens, 1000)
         else:
-            response = client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt_text}],
-                max_tokens=max_tokens,
-                temperature=temperature,
-            )
+            request["max_tokens"] = max_tokens
+        
+        response = client.chat.completions.create(**request)
         
         return response.choices[0].message.content.strip()
     
@@ -87,14 +138,14 @@ def prompt_llm_anthropic(prompt_text, model="claude-3-5-haiku-20241022", max_tok
     Returns:
         str: The model's response text, or None if error
     """
+    _ensure_env()
+    
     api_key = os.getenv("ANTHROPIC_API_KEY")
     if not api_key:
         return None
     
     try:
-        import anthropic
-        
-        client = anthropic.Anthropic(api_key=api_key)
+        client = _anthropic_client(api_key)
         
         message = client.messages.create(
             model=model,
@@ -111,10 +162,48 @@ def prompt_llm_anthropic(prompt_text, model="claude-3-5-haiku-20241022", max_tok
         return None
 
 
+def prompt_llm_hedged(prompt_text, max_tokens=1000, temperature=None):
+    """
+    Hedged LLM prompting: query OpenAI and Anthropic concurrently and return
+    the first successful response.
+    
+    Requests run on daemon threads so the slower provider never delays
+    process exit once an answer is in hand.
+    
+    Args:
+        prompt_text (str): The prompt to send to the model
+        max_tokens (int): Maximum tokens in response
+        temperature (float): Temperature for generation
+    
+    Returns:
+        str: The first successful response text, or None if both fail
+    """
+    providers = [prompt_llm_openai, prompt_llm_anthropic]
+    results = queue.Queue()
+    
+    def run(provider):
+        try:
+            response = provider(prompt_text, max_tokens=max_tokens, temperature=temperature)
+        except Exception:
+            response = None
+        results.put(response)
+    
+    for provider in providers:
+        threading.Thread(target=run, args=(provider,), daemon=True).start()
+    
+    for _ in providers:
+        response = results.get()
+        if response:
+            return response
+    
+    return None
+
+
 def prompt_llm(prompt_text, max_tokens=1000, temperature=None, prefer_openai=True):
     """
     Unified LLM prompting with fallback.
     Tries OpenAI first (with gpt-5-nano), falls back to Anthropic.
+    Set HEDGE_LLM=1 to query both concurrently and take the first answer.
     
     Args:
         prompt_text (str): The prompt to send to the model
@@ -125,7 +214,15 @@ def prompt_llm(prompt_text, max_tokens=1000, temperature=None, prefer_openai=Tru
     Returns:
         str: The model's response text, or None if both fail
     """
-    load_dotenv()
+    _ensure_env()
+    
+    # Nothing to try without a key; skip importing either SDK
+    if not os.getenv("OPENAI_API_KEY") and not os.getenv("ANTHROPIC_API_KEY"):
+        return None
+    
+    # Hedged mode trades possible double API spend for min() latency
+    if os.getenv("HEDGE_LLM") == "1":
+        return prompt_llm_hedged(prompt_text, max_tokens=max_tokens, temperature=temperature)
     
     if prefer_openai:
         # Try OpenAI first (uses model from env or defaults to gpt-4o)
@@ -155,6 +252,45 @@ def prompt_llm(prompt_text, max_tokens=1000, temperature=None, prefer_openai=Tru
     return None
 
 
+# Completion messages are cached per (engineer, day) so most Stop events can
+# reuse an earlier message instead of paying for another LLM call
+COMPLETION_CACHE_PATH = Path.home() / ".claude" / "logs" / "completion_cache.json"
+COMPLETION_CACHE_MIN_MESSAGES = 5  # Cached variety needed before reusing
+COMPLETION_CACHE_MAX_MESSAGES = 32
+COMPLETION_CACHE_REUSE_RATE = 0.8  # Share of calls served from the cache
+
+
+def _load_completion_cache():
+    """Load the completion-message cache, or an empty one if unreadable."""
+    try:
+        with open(COMPLETION_CACHE_PATH, 'r') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_completion_cache(cache):
+    """Atomically write the completion-message cache, ignoring failures."""
+    try:
+        COMPLETION_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp name: Stop hooks from parallel sessions may save at once
+        tmp_fd, tmp_name = tempfile.mkstemp(
+            dir=COMPLETION_CACHE_PATH.parent,
+            prefix=COMPLETION_CACHE_PATH.name + ".",
+            suffix=".tmp",
+        )
+        try:
+            with os.fdopen(tmp_fd, 'w') as f:
+                json.dump(cache, f)
+            os.replace(tmp_name, COMPLETION_CACHE_PATH)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    except OSError:
+        pass
+
+
 def generate_completion_message():
     """
     Generate a completion message using unified LLM with fallback.
@@ -162,8 +298,17 @@ def generate_completion_message():
     Returns:
         str: A natural language completion message, or None if error
     """
+    _ensure_env()
+    
     engineer_name = os.getenv("ENGINEER_NAME", "").strip()
     
+    # Reuse today's cached messages once there is enough variety
+    cache_key = f"{engineer_name}|{date.today().isoformat()}"
+    cached_messages = _load_completion_cache().get(cache_key, [])
+    if (len(cached_messages) >= COMPLETION_CACHE_MIN_MESSAGES
+            and random.random() < COMPLETION_CACHE_REUSE_RATE):
+        return random.choice(cached_messages)
+    
     if engineer_name:
         name_instruction = f"Sometimes (about 30% of the time) include the engineer's name '{engineer_name}' in a natural way."
         examples = f"""Examples of the style: 
@@ -196,6 +341,11 @@ Generate ONE completion message:"""
         # Take first line if multiple lines
         response = response.split("\n")[0].strip()
     
+    if response and response not in cached_messages:
+        cached_messages.append(response)
+        # Only today's entry is kept, which expires older days' messages
+        _save_completion_cache({cache_key: cached_messages[-COMPLETION_CACHE_MAX_MESSAGES:]})
+    
     return response
 
 
@@ -211,7 +361,7 @@ def main():
         elif sys.argv[1] == "--test":
             # Test both APIs
             print("Testing LLM APIs...")
-            load_dotenv()
+            _ensure_env()
             
             if os.getenv("OPENAI_API_KEY"):
                 model = os.getenv("OPENAI_MODEL_NAME", "gpt-4o")